@@ -1,47 +1,91 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import concurrent.futures
 import subprocess
 import psutil
 import os
-import re
+import threading
+import time
 
 PREFIX = "MYAPP_"  # уникальный префикс для виртуальных устройств вашей программы
 
+# Кэш вывода `pactl list short <kind>`: кнопки UI дергают перечисление часто,
+# а fork+exec pactl на каждый клик не нужен. TTL маленький, плюс явная
+# инвалидация после load/unload-module.
+_PACTL_CACHE = {}  # (argv) -> (deadline, stdout)
+_PACTL_TTL = 3.0
+
+def _pactl_short(kind, ttl=_PACTL_TTL):
+    args = ('pactl', 'list', 'short', kind)
+    cached = _PACTL_CACHE.get(args)
+    now = time.monotonic()
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    # close_fds=False: pactl не граница безопасности, а скан /proc/self/fd
+    # при fork лишний на каждом промахе кэша
+    out = subprocess.check_output(list(args), encoding='utf-8', close_fds=False)
+    _PACTL_CACHE[args] = (now + ttl, out)
+    return out
+
+def _invalidate_pactl_cache():
+    _PACTL_CACHE.clear()
+
 def get_sources():
     try:
-        out = subprocess.check_output(['pactl', 'list', 'short', 'sources'], encoding='utf-8')
+        out = _pactl_short('sources')
     except Exception as e:
         print("Ошибка получения источников:", e)
         return []
     sources = []
-    for line in out.strip().split('\n'):
-        cols = line.split('\t')
-        if len(cols) >= 2:
-            sources.append(cols[1])
+    # partition вместо split: берём только вторую колонку, без списка всех полей
+    for line in out.splitlines():
+        _, _, rest = line.partition('\t')
+        name, _, _ = rest.partition('\t')
+        if name:
+            sources.append(name)
     return sources
 
 def get_null_sinks():
     try:
-        out = subprocess.check_output(['pactl', 'list', 'short', 'sinks'], encoding='utf-8')
+        out = _pactl_short('sinks')
     except Exception as e:
         return []
-    pattern = re.compile(f'^{PREFIX}')
     sinks = []
-    for line in out.strip().split('\n'):
-        cols = line.split('\t')
-        if len(cols) >= 2:
-            name = cols[1]
-            if pattern.match(name):
-                sinks.append(name)
+    for line in out.splitlines():
+        _, _, rest = line.partition('\t')
+        name, _, _ = rest.partition('\t')
+        # фиксированный префикс — startswith быстрее и без компиляции regex
+        if name.startswith(PREFIX):
+            sinks.append(name)
     return sinks
 
+def _module_id_for_sink(sink):
+    """Ид модуля module-null-sink по имени sink'а (через кэшированный pactl)."""
+    try:
+        out = _pactl_short('modules')
+    except Exception:
+        return None
+    needle = f"sink_name={sink}"
+    for line in out.splitlines():
+        module_id, _, args = line.partition('\t')
+        if args.find(needle) != -1:
+            return module_id.strip()
+    return None
+
 def get_unique_filename(base_name="recording", ext="mp3"):
+    # Один проход по каталогу вместо stat() на каждого кандидата:
+    # при сотнях старых записей это одна порция getdents вместо N syscalls.
+    try:
+        existing = {e.name for e in os.scandir('.') if e.name.startswith(base_name)}
+    except OSError:
+        existing = set()
     filename = f"{base_name}.{ext}"
+    if filename not in existing:
+        return filename
     idx = 1
-    while os.path.exists(filename):
-        filename = f"{base_name}_{idx}.{ext}"
+    while f"{base_name}_{idx}.{ext}" in existing:
         idx += 1
-    return filename
+    return f"{base_name}_{idx}.{ext}"
 
 class RecorderApp:
     def __init__(self, root):
@@ -50,11 +94,9 @@ class RecorderApp:
         self.source_var = tk.StringVar()
         self.filename_var = tk.StringVar(value="recording")
         tk.Label(root, text="Источник аудио:").pack()
-        self.sources = get_sources()
+        self.sources = []
         self.src_box = ttk.Combobox(root, textvariable=self.source_var, values=self.sources, width=40)
         self.src_box.pack()
-        if self.sources:
-            self.src_box.current(0)
         tk.Label(root, text="Имя файла (без расширения):").pack()
         self.entry_filename = tk.Entry(root, textvariable=self.filename_var)
         self.entry_filename.pack()
@@ -72,9 +114,28 @@ class RecorderApp:
 
         self.proc = None
         self.recording_filename = None
+        # fork+exec pactl/ffmpeg — не на Tk-потоке: пул на 2 воркера, результат
+        # возвращается в UI через root.after_idle
+        self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.refresh_sources()
+
+    def _submit(self, work, done):
+        """Выполнить work() в пуле и вернуть done(future) на Tk-потоке."""
+        fut = self._exec.submit(work)
+        fut.add_done_callback(lambda f: self.root.after_idle(done, f))
+
+    def _set_widgets_state(self, widgets, state):
+        for w in widgets:
+            w.config(state=state)
 
     def refresh_sources(self):
-        self.sources = get_sources()
+        self._submit(get_sources, self._apply_sources)
+
+    def _apply_sources(self, fut):
+        try:
+            self.sources = fut.result()
+        except Exception:
+            self.sources = []
         self.src_box['values'] = self.sources
         if self.sources:
             self.src_box.current(0)
@@ -82,9 +143,15 @@ class RecorderApp:
             self.source_var.set("")
 
     def create_virtual_device(self):
+        self._submit(get_null_sinks, self._create_vdev_dialog)
+
+    def _create_vdev_dialog(self, fut):
+        try:
+            existings = set(fut.result())
+        except Exception:
+            existings = set()
         # Предлагаем уникальное имя пользователю (можно автогенерировать или спросить)
         vdev_base = PREFIX + "VIRTUAL_SPEAKER"
-        existings = get_null_sinks()
         unique_name = vdev_base
         idx = 1
         while unique_name in existings:
@@ -95,22 +162,36 @@ class RecorderApp:
             return
         if not desc.startswith(PREFIX):
             desc = PREFIX + desc  # гарантируем префикс
-        if desc in get_null_sinks():
+        if desc in existings:
             messagebox.showerror("Ошибка", "Устройство с таким именем уже существует!")
             return
-        try:
+
+        def _load():
             subprocess.check_call([
                 "pactl", "load-module", "module-null-sink",
                 f"sink_name={desc}",
                 f"sink_properties=device.description={desc}_Device"
-            ])
-            self.refresh_sources()
-            messagebox.showinfo("Успех", f"Создано виртуальное устройство: {desc}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка создания: {e}")
+            ], close_fds=False)
+            _invalidate_pactl_cache()
+
+        self._submit(_load, lambda f: self._on_vdev_created(f, desc))
+
+    def _on_vdev_created(self, fut, desc):
+        err = fut.exception()
+        if err:
+            messagebox.showerror("Ошибка", f"Ошибка создания: {err}")
+            return
+        self.refresh_sources()
+        messagebox.showinfo("Успех", f"Создано виртуальное устройство: {desc}")
 
     def delete_virtual_device(self):
-        sinks = get_null_sinks()
+        self._submit(get_null_sinks, self._delete_vdev_dialog)
+
+    def _delete_vdev_dialog(self, fut):
+        try:
+            sinks = fut.result()
+        except Exception:
+            sinks = []
         if not sinks:
             messagebox.showinfo("Нет устройств", f"Нет виртуальных устройств с префиксом {PREFIX}")
             return
@@ -118,22 +199,25 @@ class RecorderApp:
         if not sink or not sink.startswith(PREFIX):
             messagebox.showwarning("Внимание", "Можно удалять только свои (с префиксом) устройства!")
             return
-        # Найти индекс модуля по pactl list short modules
-        try:
-            out = subprocess.check_output(["pactl", "list", "short", "modules"], encoding='utf-8')
-            module_id = None
-            for line in out.splitlines():
-                if f"sink_name={sink}" in line:
-                    module_id = line.split('\t')[0].strip()
-                    break
+
+        def _unload():
+            # Найти индекс модуля по pactl list short modules (кэш: подряд идущие
+            # удаления в пределах TTL не форкают pactl заново)
+            module_id = _module_id_for_sink(sink)
             if not module_id:
-                messagebox.showerror("Ошибка", "Не нашли модуль для удаления!")
-                return
-            subprocess.check_call(["pactl", "unload-module", module_id])
-            self.refresh_sources()
-            messagebox.showinfo("Удалено", f"Виртуальное устройство {sink} удалено")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка удаления: {e}")
+                raise RuntimeError("Не нашли модуль для удаления!")
+            subprocess.check_call(["pactl", "unload-module", module_id], close_fds=False)
+            _invalidate_pactl_cache()
+
+        self._submit(_unload, lambda f: self._on_vdev_deleted(f, sink))
+
+    def _on_vdev_deleted(self, fut, sink):
+        err = fut.exception()
+        if err:
+            messagebox.showerror("Ошибка", f"Ошибка удаления: {err}")
+            return
+        self.refresh_sources()
+        messagebox.showinfo("Удалено", f"Виртуальное устройство {sink} удалено")
 
     def start_recording(self):
         source = self.source_var.get()
@@ -142,34 +226,46 @@ class RecorderApp:
             return
         base_name = self.filename_var.get().strip() or "recording"
         self.recording_filename = get_unique_filename(base_name, ext="mp3")
-        self.proc = subprocess.Popen([
+        cmd = [
             'ffmpeg',
             '-y',  # overwrite
             '-f', 'pulse', '-i', source,
             '-vn', '-acodec', 'libmp3lame', '-ar', '44100', '-ac', '2', self.recording_filename
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        self.btn_rec.config(state=tk.DISABLED)
+        ]
+        # Виджеты блокируем сразу, сам запуск ffmpeg — в пуле
+        self._set_widgets_state((self.btn_rec, self.entry_filename, self.src_box), tk.DISABLED)
         self.btn_stop.config(state=tk.NORMAL)
-        self.entry_filename.config(state=tk.DISABLED)
-        self.src_box.config(state=tk.DISABLED)
+        self._submit(
+            lambda: subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+            self._on_recording_started,
+        )
+
+    def _on_recording_started(self, fut):
+        err = fut.exception()
+        if err:
+            self._set_widgets_state((self.btn_rec, self.entry_filename, self.src_box), tk.NORMAL)
+            self.btn_stop.config(state=tk.DISABLED)
+            messagebox.showerror("Ошибка", f"ffmpeg не запустился: {err}")
+            return
+        self.proc = fut.result()
 
     def stop_recording(self):
         if self.proc and psutil.pid_exists(self.proc.pid):
             self.btn_stop.config(state=tk.DISABLED)
             self.proc.terminate()
-            self.root.after(100, self.check_process_ended)
+            # Ждём завершения в фоне: ядро разбудит wait() сразу по выходу ffmpeg,
+            # без 100-мс опроса через root.after.
+            threading.Thread(target=self._await_proc, args=(self.proc,), daemon=True).start()
         else:
             self.on_recording_finished()
-    def check_process_ended(self):
-        if self.proc.poll() is not None:
-            self.proc = None
-            self.on_recording_finished()
-        else:
-            self.root.after(100, self.check_process_ended)
+    def _await_proc(self, proc):
+        proc.wait()
+        self.root.after_idle(self._on_proc_ended)
+    def _on_proc_ended(self):
+        self.proc = None
+        self.on_recording_finished()
     def on_recording_finished(self):
-        self.btn_rec.config(state=tk.NORMAL)
-        self.entry_filename.config(state=tk.NORMAL)
-        self.src_box.config(state=tk.NORMAL)
+        self._set_widgets_state((self.btn_rec, self.entry_filename, self.src_box), tk.NORMAL)
         messagebox.showinfo("Готово", f"Запись сохранена как {self.recording_filename}")
 
 if __name__ == "__main__":
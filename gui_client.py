@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import asyncio
+import concurrent.futures
+import functools
 import ipaddress
 import json
 import shutil
+import socket
 import subprocess
 import sys
 import threading
@@ -12,7 +15,8 @@ import re
 from urllib.parse import urlencode, urlparse
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError, URLError
-from dataclasses import dataclass
+from contextlib import suppress
+from dataclasses import dataclass, replace
 from typing import List, Tuple, Optional, Callable
 
 import platform
@@ -29,7 +33,7 @@ from livekit_client import LiveKitStreamClient, LiveKitState
 from env_loader import load_env_files
 
 try:
-    from aiohttp import ClientSession, WSMsgType, ClientConnectorError, WSServerHandshakeError
+    from aiohttp import ClientSession, TCPConnector, WSMsgType, ClientConnectorError, WSServerHandshakeError
 except Exception as e:
     print("Не установлен aiohttp. Установите: pip install aiohttp", file=sys.stderr)
     raise
@@ -177,62 +181,74 @@ DEFAULT_LIVEKIT_IDENTITY = os.getenv("LIVEKIT_PUBLISHER_IDENTITY", "publisher-lo
 
 # ---------------- Утилиты обнаружения устройств ----------------
 
+# Общий кэш вывода команд перечисления (pactl/arecord): устройства меняются
+# редко, а fork+exec на каждый refresh/переключение backend'а заметен.
+# TTL небольшой, плюс явная инвалидация после load/unload-module.
+_SUBPROC_CACHE = {}  # cmd_tuple -> (deadline, stdout)
+_SUBPROC_TTL = 5.0
+
+
+def _cached_check_output(cmd: Tuple[str, ...], ttl: float = _SUBPROC_TTL) -> str:
+    cached = _SUBPROC_CACHE.get(cmd)
+    now = time.monotonic()
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    out = subprocess.check_output(
+        list(cmd), text=True, errors="replace", stderr=subprocess.STDOUT
+    )
+    _SUBPROC_CACHE[cmd] = (now + ttl, out)
+    return out
+
+
+def _invalidate_device_cache():
+    _SUBPROC_CACHE.clear()
+
+
+# Строка `arecord -l`: "card 1: PCH [HDA Intel PCH], device 0: ALC887 Analog [...]"
+_ARECORD_CARD_RE = re.compile(r"^\s*card (\d+):\s*(.+?),\s*device (\d+):\s*(.+)$", re.M)
+
+
 def list_alsa_devices() -> List[Tuple[str, str]]:
     """
     Возвращает список устройств ALSA как [(id, label)], где id можно передать в ffmpeg.
     """
     result: List[Tuple[str, str]] = [("default", "default (ALSA по умолчанию)")]
     try:
-        out = subprocess.check_output([ARECORD_BIN, "-l"], stderr=subprocess.STDOUT, text=True, errors="replace")
-        lines = out.splitlines()
-        for line in lines:
-            line = line.strip()
-            if line.startswith("card ") and ", device " in line:
-                try:
-                    prefix, rest = line.split(":", 1)
-                    _, card_num_str = prefix.split("card", 1)
-                    card_num = int(card_num_str.strip())
-                    dev_part = rest.split(", device", 1)[1]
-                    dev_num = int(dev_part.split(":")[0].strip())
-                    card_name = rest.split(", device", 1)[0].strip()
-                    dev_name = dev_part.split(":", 1)[1].strip()
-                    alsa_id = f"hw:{card_num},{dev_num}"
-                    label = f"{alsa_id} — {card_name} / {dev_name}"
-                    result.append((alsa_id, label))
-                except Exception:
-                    continue
+        out = _cached_check_output((ARECORD_BIN, "-l"))
+        for m in _ARECORD_CARD_RE.finditer(out):
+            card_num, card_name, dev_num, dev_name = m.groups()
+            alsa_id = f"hw:{card_num},{dev_num}"
+            result.append((alsa_id, f"{alsa_id} — {card_name.strip()} / {dev_name.strip()}"))
     except Exception:
         pass
-    # dedup, keep order
-    seen = set()
-    uniq: List[Tuple[str, str]] = []
-    for i, l in result:
-        if i not in seen:
-            uniq.append((i, l))
-            seen.add(i)
-    return uniq
+    # dedup по id, порядок сохраняется
+    return list({i: l for i, l in reversed(result)}.items())[::-1]
+
+# Наличие бинарника не меняется за время жизни процесса — один stat() при
+# импорте вместо syscall'а на каждый вызов из GUI-колбэков
+_HAS_PACTL = os.path.exists(PACTL_BIN)
+
 
 def has_pactl() -> bool:
-    return os.path.exists(PACTL_BIN)
+    return _HAS_PACTL
+
+# Вторая колонка (имя) каждой строки `pactl list short …` одним findall —
+# без splitlines/split и списков подстрок на каждую строку
+_PACTL_SHORT_NAME_RE = re.compile(r"^[^\t\n]*\t([^\t\n]+)", re.M)
+
 
 def list_pulse_sources() -> List[Tuple[str, str]]:
     """
     Возвращает список источников PulseAudio [(name, label)] из 'pactl list short sources'.
     Чаще всего для записи нужен монитор sink'а: <sink>.monitor.
     """
-    res: List[Tuple[str, str]] = []
     if not has_pactl():
-        return res
+        return []
     try:
-        out = subprocess.check_output([PACTL_BIN, "list", "short", "sources"], encoding="utf-8", stderr=subprocess.STDOUT)
-        for line in out.strip().splitlines():
-            cols = line.split("\t")
-            if len(cols) >= 2:
-                name = cols[1]
-                res.append((name, name))
+        out = _cached_check_output((PACTL_BIN, "list", "short", "sources"))
     except Exception:
-        pass
-    return res
+        return []
+    return [(name, name) for name in _PACTL_SHORT_NAME_RE.findall(out)]
 
 def get_null_sinks() -> List[str]:
     """
@@ -241,18 +257,10 @@ def get_null_sinks() -> List[str]:
     if not has_pactl():
         return []
     try:
-        out = subprocess.check_output([PACTL_BIN, "list", "short", "sinks"], encoding="utf-8", stderr=subprocess.STDOUT)
+        out = _cached_check_output((PACTL_BIN, "list", "short", "sinks"))
     except Exception:
         return []
-    pattern = re.compile(f"^{re.escape(PREFIX)}")
-    sinks = []
-    for line in out.strip().splitlines():
-        cols = line.split("\t")
-        if len(cols) >= 2:
-            name = cols[1]
-            if pattern.match(name):
-                sinks.append(name)
-    return sinks
+    return [name for name in _PACTL_SHORT_NAME_RE.findall(out) if name.startswith(PREFIX)]
 
 def create_virtual_device_interactive(parent: tk.Tk):
     """
@@ -283,6 +291,7 @@ def create_virtual_device_interactive(parent: tk.Tk):
             f"sink_name={desc}",
             f"sink_properties=device.description={desc}_Device"
         ])
+        _invalidate_device_cache()
         messagebox.showinfo("Успех", f"Создан виртуальный sink: {desc}\nИсточник для записи: {desc}.monitor", parent=parent)
     except Exception as e:
         messagebox.showerror("Ошибка", f"Не удалось создать виртуальный sink: {e}", parent=parent)
@@ -305,7 +314,7 @@ def delete_virtual_device_interactive(parent: tk.Tk):
         messagebox.showwarning("Внимание", "Можно удалять только свои устройства (с префиксом).", parent=parent)
         return
     try:
-        out = subprocess.check_output([PACTL_BIN, "list", "short", "modules"], encoding="utf-8")
+        out = _cached_check_output((PACTL_BIN, "list", "short", "modules"))
         module_id = None
         for line in out.splitlines():
             if f"sink_name={sink}" in line:
@@ -315,17 +324,43 @@ def delete_virtual_device_interactive(parent: tk.Tk):
             messagebox.showerror("Ошибка", "Не нашли модуль для удаления!", parent=parent)
             return
         subprocess.check_call([PACTL_BIN, "unload-module", module_id])
+        _invalidate_device_cache()
         messagebox.showinfo("Удалено", f"Виртуальный sink {sink} удалён", parent=parent)
     except Exception as e:
         messagebox.showerror("Ошибка", f"Ошибка удаления: {e}", parent=parent)
 
 # ---------------- ffmpeg command ----------------
 
+_F_SETPIPE_SZ = 1031  # Linux-специфичный fcntl; константы нет в модуле fcntl
+
+
+def _enlarge_stdout_pipe(proc) -> None:
+    """Расширить kernel-буфер stdout-пайпа ffmpeg до ~1 МиБ (Linux).
+
+    Дефолтные 64 КиБ заставляют ffmpeg блокироваться на записи, когда Python
+    занят (GC, обновление GUI); больший буфер сглаживает такие паузы.
+    Не критично — при любой ошибке остаёмся на размере по умолчанию.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        import fcntl
+
+        pipe = proc._transport.get_pipe_transport(1).get_extra_info("pipe")
+        if pipe is not None:
+            fcntl.fcntl(pipe.fileno(), _F_SETPIPE_SZ, 1 << 20)
+    except Exception:
+        pass
+
+# Кэш по аргументам: команда полностью детерминирована параметрами, а
+# старт/стоп одного и того же устройства — обычный сценарий. Tuple, а не
+# list: результат неизменяемый и его безопасно разделять между вызовами.
+@functools.lru_cache(maxsize=32)
 def build_ffmpeg_cmd(input_backend: str, device: str, channels: int, rate: int, bitrate_kbps: int):
     if not FFMPEG_BIN:
         raise RuntimeError("ffmpeg не найден. Установите пакет ffmpeg.")
     if input_backend == "pulse":
-        return [
+        return (
             FFMPEG_BIN,
             "-hide_banner",
             "-loglevel", "error",
@@ -337,9 +372,9 @@ def build_ffmpeg_cmd(input_backend: str, device: str, channels: int, rate: int,
             "-b:a", f"{bitrate_kbps}k",
             "-f", "mp3",
             "-"  # stdout
-        ]
+        )
     elif input_backend == "alsa":
-        return [
+        return (
             FFMPEG_BIN,
             "-hide_banner",
             "-loglevel", "error",
@@ -351,7 +386,7 @@ def build_ffmpeg_cmd(input_backend: str, device: str, channels: int, rate: int,
             "-b:a", f"{bitrate_kbps}k",
             "-f", "mp3",
             "-"
-        ]
+        )
     else:
         raise ValueError(f"Неизвестный backend: {input_backend}")
 
@@ -388,6 +423,26 @@ def request_publisher_token(helper_url: str, room: str, identity: str, pairing_s
 
 # ---------------- Streaming core (asyncio in a background thread) ----------------
 
+# orjson парсит мелкие служебные сообщения заметно быстрее stdlib json и
+# принимает bytes без decode; строго опционален — без него поведение то же.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _new_stream_loop() -> asyncio.AbstractEventLoop:
+    """Цикл для фонового стриминга: uvloop, если установлен (Linux), иначе штатный.
+
+    uvloop заметно дешевле на сокетах/пайпах, но строго опционален —
+    на Windows его нет, поведение без него не меняется.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
 @dataclass
 class StreamState:
     running: bool = False
@@ -395,10 +450,46 @@ class StreamState:
     listeners: int = 0
     uptime_sec: float = 0.0
     sent_bytes: int = 0
+    dropped_bytes: int = 0
     last_error: str = ""
 
 UpdateCallback = Callable[[StreamState], None]
 
+# Размер одного чтения из stdout ffmpeg: крупнее — меньше syscalls и пробуждений
+# цикла на тот же битрейт (read() вернёт сколько есть, ожидания добора нет);
+# 64 КиБ покрывает целиком дефолтный kernel-буфер пайпа за одно чтение
+SEND_CHUNK = 65536
+# Целевой размер исходящего WS-кадра: MP3 и так сжат, так что крупные кадры
+# только уменьшают накладные расходы на заголовки/маскирование.
+SEND_TARGET = 16384
+# Максимум, сколько держим недобранный батч: ограничивает добавку к задержке эфира
+FLUSH_INTERVAL = 0.02
+# Порог write-буфера транспорта, после которого уступаем цикл перед новым чтением
+_WS_HIGH_WATER = 64 * 1024
+# Потолок приёмного накопителя между чтением пайпа и отправкой: ~8 секунд
+# на 128 кбит/с; всё сверх вытесняется с начала (drop-oldest)
+_RX_MAX_BUFFER = 1 << 20
+
+
+def _set_tcp_nodelay(ws) -> None:
+    """Отключить Nagle на сокете WS: мелкие аудио-кадры должны уходить сразу,
+    а не ждать до ~40 мс склейки в ядре. Best-effort — внутренности aiohttp."""
+    try:
+        sock = ws._writer.transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except Exception:
+        pass
+
+
+def _ws_write_buffer_size(ws) -> int:
+    """Сколько байтов ещё не ушло в сокет; 0, если внутренности aiohttp недоступны."""
+    try:
+        return ws._writer.transport.get_write_buffer_size()
+    except Exception:
+        return 0
+
+
 class StreamClient:
     def __init__(self, ui_callback: UpdateCallback):
         self.ui_callback = ui_callback
@@ -407,16 +498,23 @@ class StreamClient:
         self.session: Optional[ClientSession] = None
         self.ws = None
         self.proc: Optional[asyncio.subprocess.Process] = None
+        self.read_task: Optional[asyncio.Task] = None
         self.send_task: Optional[asyncio.Task] = None
         self.recv_task: Optional[asyncio.Task] = None
+        self._rx: Optional[bytearray] = None
+        self._rx_eof = False
+        self._q_event: Optional[asyncio.Event] = None
         self.stop_event: Optional[asyncio.Event] = None
         self.state = StreamState()
+        # Диспетчеризация служебных сообщений по "type" — добавление нового
+        # типа не удлиняет цепочку if/elif в горячем _recv_loop
+        self._ws_handlers = {"ack": self._on_ack, "stats": self._on_stats}
 
     # ---- event loop management ----
     def ensure_loop(self):
         if self.loop and self.loop.is_running():
             return
-        self.loop = asyncio.new_event_loop()
+        self.loop = _new_stream_loop()
         self.loop_thread = threading.Thread(target=self.loop.run_forever, name="stream-loop", daemon=True)
         self.loop_thread.start()
 
@@ -437,7 +535,21 @@ class StreamClient:
             return
         self.run_coro(self._stop_async())
 
+    def dispose(self):
+        """Окончательное закрытие (выход из приложения) — гасим сессию."""
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._cleanup_session(), self.loop)
+
     # ---- internal async logic ----
+    def _ensure_session(self):
+        # Одна сессия на всё время жизни клиента: создание ClientSession —
+        # это коннектор, DNS-резолвер и пул соединений, слишком дорого,
+        # чтобы собирать/разбирать её на каждый стрим.
+        if self.session is None or self.session.closed:
+            self.session = ClientSession(
+                connector=TCPConnector(limit=4, ttl_dns_cache=300)
+            )
+
     async def _start_async(self, server_url: str, backend: str, device: str, channels: int, rate: int, bitrate: int, chunk_size: int):
         self.stop_event = asyncio.Event()
         self.state = StreamState(running=True)
@@ -456,8 +568,12 @@ class StreamClient:
             self.proc = await asyncio.create_subprocess_exec(
                 *ff_cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                # stderr никто не читал: заполнившийся пайп подвесил бы ffmpeg
+                # на болтливом выводе. Диагностика запуска видна по коду выхода.
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=1 << 20,  # high-water StreamReader'а: дефолтные 64 КиБ малы для аудиопотока
             )
+            _enlarge_stdout_pipe(self.proc)
         except Exception as e:
             self.state.last_error = f"ffmpeg не запустился: {e}"
             self.state.running = False
@@ -466,25 +582,35 @@ class StreamClient:
 
         # Open WebSocket
         try:
-            self.session = ClientSession()
-            self.ws = await self.session.ws_connect(server_url, heartbeat=10.0)
+            self._ensure_session()
+            # compress=0: MP3 уже сжат, permessage-deflate только жжёт CPU на
+            # каждом кадре; max_msg_size=0 снимает лимит на входящие кадры.
+            self.ws = await self.session.ws_connect(
+                server_url, heartbeat=10.0, compress=0, max_msg_size=0, autoping=True
+            )
+            _set_tcp_nodelay(self.ws)
         except (ClientConnectorError, WSServerHandshakeError) as e:
             self.state.last_error = f"WS ошибка подключения: {e}"
             self.state.running = False
             self.ui_callback(self.state)
             await self._cleanup_subprocess()
-            await self._cleanup_session()
             return
         except Exception as e:
             self.state.last_error = f"WS исключение: {e}"
             self.state.running = False
             self.ui_callback(self.state)
             await self._cleanup_subprocess()
-            await self._cleanup_session()
             return
 
         # Launch loops
-        self.send_task = asyncio.create_task(self._send_loop(chunk_size))
+        # Чтение пайпа и отправка в WS — отдельные задачи через общий bytearray
+        # с вытеснением старого: живому эфиру потеря данных при плохой сети
+        # предпочтительнее неограниченного роста задержки или стопа ffmpeg.
+        self._rx = bytearray()
+        self._rx_eof = False
+        self._q_event = asyncio.Event()
+        self.read_task = asyncio.create_task(self._read_loop(chunk_size))
+        self.send_task = asyncio.create_task(self._send_loop())
         self.recv_task = asyncio.create_task(self._recv_loop())
 
         # Await stop
@@ -492,57 +618,174 @@ class StreamClient:
         # Teardown
         await self._teardown()
 
-    async def _send_loop(self, chunk_size: int):
-        last_report = time.time()
+    def _try_raw_reader(self, loop, ready: asyncio.Event):
+        """Перевести stdout ffmpeg на сырой неблокирующий fd + add_reader.
+
+        StreamReader поверх пайпа — это транспорт, протокол и лишняя копия
+        на каждый чанк; os.read напрямую всё это обходит. Возвращает fd или
+        None (остаёмся на StreamReader): внутренности транспорта
+        CPython-специфичны, а uvloop может не отдать pipe/не принять fd.
+        """
+        try:
+            tr = self.proc._transport.get_pipe_transport(1)
+            fd = tr.get_extra_info("pipe").fileno()
+            # Сначала останавливаем транспорт, чтобы не конкурировать за fd
+            tr.pause_reading()
+        except Exception:
+            return None
+        try:
+            os.set_blocking(fd, False)
+            loop.add_reader(fd, ready.set)
+            return fd
+        except Exception:
+            with suppress(Exception):
+                tr.resume_reading()
+            return None
+
+    async def _read_loop(self, chunk_size: int):
+        """Продюсер: дренирует stdout ffmpeg в общий bytearray без блокировки.
+
+        На сыром fd чтение идёт через os.readv в преаллоцированный буфер —
+        ни одного промежуточного bytes-объекта на чанк. При медленном uplink
+        из накопителя вытесняются самые старые байты (считается в dropped_bytes
+        и видно в GUI) — пайп ffmpeg дренируется всегда, а слушатель получает
+        свежий звук вместо накопленной задержки.
+        """
+        rx, wake = self._rx, self._q_event
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        fd = self._try_raw_reader(loop, ready)
+        # Многоразовый буфер чтения: переиспользуется между итерациями,
+        # в rx копируется срезом memoryview
+        scratch = bytearray(chunk_size)
+        mv = memoryview(scratch)
         try:
             while not self.stop_event.is_set():
-                if not self.proc or not self.proc.stdout:
-                    await asyncio.sleep(0.05)
-                    continue
-                chunk = await self.proc.stdout.read(chunk_size)
-                if not chunk:
-                    if self.proc.returncode is not None:
-                        self.state.last_error = f"ffmpeg завершился с кодом {self.proc.returncode}"
-                        break
-                    await asyncio.sleep(0.01)
-                    continue
-                if self.ws is not None:
-                    await self.ws.send_bytes(chunk)
-                self.state.sent_bytes += len(chunk)
-                now = time.time()
-                if now - last_report >= 1.0:
-                    self.ui_callback(self.state)
-                    last_report = now
+                if fd is not None:
+                    try:
+                        n = os.readv(fd, (mv,))
+                    except BlockingIOError:
+                        ready.clear()
+                        await ready.wait()
+                        continue
+                    chunk = mv[:n]
+                else:
+                    chunk = await self.proc.stdout.read(chunk_size)
+                    n = len(chunk)
+                if n == 0:
+                    # 0 байт и на сыром fd, и у StreamReader — только EOF: ffmpeg завершился
+                    rc = self.proc.returncode
+                    if rc not in (None, 0):
+                        self.state.last_error = f"ffmpeg завершился с кодом {rc}"
+                    break
+                rx += chunk
+                overflow = len(rx) - _RX_MAX_BUFFER
+                if overflow > 0:
+                    self.state.dropped_bytes += overflow
+                    del rx[:overflow]
+                wake.set()
+                if fd is not None:
+                    # os.readv не даёт точек переключения — уступаем цикл,
+                    # чтобы отправитель успевал дренировать буфер
+                    await asyncio.sleep(0)
+            self._rx_eof = True
+            wake.set()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.state.last_error = f"Ошибка чтения ffmpeg: {e}"
+            if self.stop_event and not self.stop_event.is_set():
+                self.stop_event.set()
+        finally:
+            if fd is not None:
+                with suppress(Exception):
+                    loop.remove_reader(fd)
+
+    async def _send_loop(self):
+        loop = asyncio.get_running_loop()
+        buf = bytearray()
+        # Счётчик копится в локальной переменной и публикуется в state на
+        # границе кадра — без атрибутного store на каждый принятый кусок
+        sent = self.state.sent_bytes
+
+        async def _flush():
+            self.state.sent_bytes = sent
+            if self.ws is not None:
+                # aiohttp маскирует кадр в собственную копию до первого await,
+                # поэтому bytearray можно отдавать как есть и переиспользовать —
+                # минус одна аллокация bytes(buf) на каждый кадр
+                await self.ws.send_bytes(buf)
+                # send_bytes уже дренирует по high-water aiohttp; дополнительно
+                # уступаем цикл, пока транспорт не разгрузится — ffmpeg в это
+                # время упирается в пайп, память не растёт неограниченно
+                if _ws_write_buffer_size(self.ws) > _WS_HIGH_WATER:
+                    await asyncio.sleep(0)
+            buf.clear()
+
+        rx, wake = self._rx, self._q_event
+        try:
+            next_flush = loop.time() + FLUSH_INTERVAL
+            while not self.stop_event.is_set():
+                # Ждём данных; с недобранным батчем — не дольше, чем до
+                # дедлайна FLUSH_INTERVAL: даже при тихом ffmpeg кадр уходит вовремя.
+                if not rx and not self._rx_eof:
+                    if buf:
+                        remaining = next_flush - loop.time()
+                        if remaining <= 0.0:
+                            await _flush()
+                            continue
+                        try:
+                            await asyncio.wait_for(wake.wait(), timeout=remaining)
+                        except asyncio.TimeoutError:
+                            continue  # дедлайн истёк — сброс на следующем витке
+                    else:
+                        await wake.wait()
+                        next_flush = loop.time() + FLUSH_INTERVAL
+                wake.clear()
+                # Забираем всё накопившееся одним куском
+                if rx:
+                    sent += len(rx)
+                    buf += rx
+                    rx.clear()
+                elif self._rx_eof:
+                    break  # EOF от продюсера
+                if len(buf) >= SEND_TARGET:
+                    await _flush()
+            if buf:
+                await _flush()  # хвост на EOF/остановке
         except asyncio.CancelledError:
             pass
         except Exception as e:
             self.state.last_error = f"Ошибка отправки: {e}"
         finally:
+            self.state.sent_bytes = sent
             self.ui_callback(self.state)
             if self.stop_event and not self.stop_event.is_set():
                 self.stop_event.set()
 
     async def _recv_loop(self):
+        # Локальные привязки констант: на каждое сообщение остаётся одно
+        # сравнение вместо цепочки атрибутных lookups WSMsgType.*
+        TEXT, BINARY, CLOSE, ERROR = WSMsgType.TEXT, WSMsgType.BINARY, WSMsgType.CLOSE, WSMsgType.ERROR
         try:
             async for msg in self.ws:
-                if msg.type == WSMsgType.TEXT:
+                t = msg.type
+                # BINARY наравне с TEXT: сервер может слать служебный JSON
+                # байтами и миновать обязательную UTF-8-валидацию текстовых
+                # кадров (orjson и json.loads принимают bytes напрямую)
+                if t is TEXT or t is BINARY:
                     try:
-                        data = json.loads(msg.data)
+                        data = _json_loads(msg.data)
                     except Exception:
-                        data = None
-                    if data:
-                        if data.get("type") == "ack":
-                            self.state.ack = True
-                            self.state.listeners = int(data.get("listeners", 0))
-                            self.ui_callback(self.state)
-                        elif data.get("type") == "stats":
-                            self.state.listeners = int(data.get("listeners", 0))
-                            self.state.uptime_sec = float(data.get("uptime_sec", 0.0))
-                            self.ui_callback(self.state)
-                elif msg.type == WSMsgType.ERROR:
-                    self.state.last_error = f"WS ошибка: {self.ws.exception()}"
-                    break
-                elif msg.type == WSMsgType.CLOSE:
+                        continue
+                    handler = self._ws_handlers.get(data.get("type")) if isinstance(data, dict) else None
+                    if handler:
+                        handler(data)
+                elif t is ERROR or t is CLOSE:
+                    # aiohttp сам собирает CONTINUATION и отвечает на PING, так что
+                    # сюда доходят только данные и завершение — одна ветка на выход
+                    if t is ERROR:
+                        self.state.last_error = f"WS ошибка: {self.ws.exception()}"
                     break
         except asyncio.CancelledError:
             pass
@@ -553,26 +796,44 @@ class StreamClient:
             if self.stop_event and not self.stop_event.is_set():
                 self.stop_event.set()
 
+    def _on_ack(self, data: dict):
+        self.state.ack = True
+        self.state.listeners = int(data.get("listeners", 0))
+        self.ui_callback(self.state)
+
+    def _on_stats(self, data: dict):
+        self.state.listeners = int(data.get("listeners", 0))
+        self.state.uptime_sec = float(data.get("uptime_sec", 0.0))
+        self.ui_callback(self.state)
+
     async def _stop_async(self):
         if self.stop_event and not self.stop_event.is_set():
             self.stop_event.set()
 
     async def _teardown(self):
-        for t in (self.send_task, self.recv_task):
-            if t and not t.done():
-                t.cancel()
-                with contextlib_suppress():
-                    await t
-        await self._cleanup_ws()
-        await self._cleanup_session()
-        await self._cleanup_subprocess()
+        # Отмена задач и закрытие ресурсов — параллельно: задержка остановки
+        # равна максимальному из таймаутов, а не их сумме (кнопка «Стоп»
+        # отпускает GUI заметно быстрее).
+        tasks = [t for t in (self.read_task, self.send_task, self.recv_task) if t and not t.done()]
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            with suppress(Exception):
+                async with asyncio.timeout(2.0):
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        # Сессия намеренно переживает остановку: повторный «Старт» — это один
+        # TCP+WS handshake по тёплому пулу, а не пересоздание коннектора и DNS.
+        with suppress(Exception):
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._cleanup_ws())
+                tg.create_task(self._cleanup_subprocess())
         self.state.running = False
         self.ui_callback(self.state)
 
     async def _cleanup_ws(self):
         try:
             if self.ws is not None:
-                with contextlib_suppress():
+                with suppress(Exception):
                     await self.ws.close()
         finally:
             self.ws = None
@@ -580,34 +841,27 @@ class StreamClient:
     async def _cleanup_session(self):
         try:
             if self.session is not None:
-                with contextlib_suppress():
+                with suppress(Exception):
                     await self.session.close()
         finally:
             self.session = None
 
     async def _cleanup_subprocess(self):
         if self.proc:
-            with contextlib_suppress():
+            with suppress(Exception):
                 self.proc.terminate()
             try:
                 await asyncio.wait_for(self.proc.wait(), timeout=3.0)
             except Exception:
-                with contextlib_suppress():
+                with suppress(Exception):
                     self.proc.kill()
             self.proc = None
 
 
-class contextlib_suppress:
-    def __init__(self, *exc):
-        self.exc = exc or (Exception,)
-    def __enter__(self): return None
-    def __exit__(self, exc_type, exc, tb): return exc_type and issubclass(exc_type, self.exc)
-
-
 class LiveKitClientAdapter:
     def __init__(self, ui_callback: Callable[[LiveKitState], None]):
         self._client = LiveKitStreamClient(ui_callback)
-        self._loop = asyncio.new_event_loop()
+        self._loop = _new_stream_loop()
         self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="livekit-loop")
         self._thread.start()
 
@@ -657,6 +911,11 @@ class App(tk.Tk):
         self.input_devices: List[AudioInputDevice] = []
         self.loopback_devices: List[AudioInputDevice] = []
         self.mic_devices: List[AudioInputDevice] = []
+        # Перечисление устройств — fork pactl/arecord и опрос sounddevice —
+        # не на Tk-потоке: пул на 2 воркера, результат возвращается через after
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._refreshing = False
+        self._combo_keys = {}  # widget -> tuple значений с прошлого обновления
 
         pad = {"padx": 8, "pady": 6}
         frm = ttk.Frame(self)
@@ -782,12 +1041,27 @@ class App(tk.Tk):
         self.spin_bitrate.grid(row=9, column=1, sticky="w", **pad)
 
         # Status
-        self.lbl_status = ttk.Label(frm, text="Статус: offline", foreground="#b00")
+        # Текст меток — через StringVar с dirty-guard в рендере: каждое
+        # config(text=...) это отдельный Tcl-вызов, незачем повторять его
+        # с тем же содержимым на каждом событии состояния.
+        self.var_status = tk.StringVar(value="Статус: offline")
+        self.var_extra = tk.StringVar(value="LiveKit room: - | Connected: no")
+        self.var_bytes = tk.StringVar(value="")
+        self._last_status = ("", "")
+        self._last_extra = ""
+        self._last_bytes_key = None
+        self._last_render = None
+        self.lbl_status = ttk.Label(frm, textvariable=self.var_status, foreground="#b00")
         self.lbl_status.grid(row=10, column=0, sticky="w", **pad, columnspan=4)
 
-        self.lbl_extra = ttk.Label(frm, text="LiveKit room: - | Connected: no", foreground="#333")
+        self.lbl_extra = ttk.Label(frm, textvariable=self.var_extra, foreground="#333")
         self.lbl_extra.grid(row=11, column=0, sticky="w", **pad, columnspan=4)
 
+        # Счётчик байтов меняется чаще всего — отдельная метка, чтобы его
+        # обновления не переформатировали строку слушателей/аптайма
+        self.lbl_bytes = ttk.Label(frm, textvariable=self.var_bytes, foreground="#333")
+        self.lbl_bytes.grid(row=12, column=0, sticky="w", **pad, columnspan=2)
+
         # Buttons
         self.btn_start = ttk.Button(frm, text="Старт", command=self.on_start)
         self.btn_stop = ttk.Button(frm, text="Стоп", command=self.on_stop, state="disabled")
@@ -833,8 +1107,17 @@ class App(tk.Tk):
         # Initial populate
         self.on_transport_changed()
 
-        # Periodic UI updater
-        self.after(1000, self._tick)
+        # Снимки состояния из фоновых потоков: слот + один отложенный рендер
+        # вместо after(0) на каждое событие
+        self._pending_lock = threading.Lock()
+        self._pending_legacy: Optional[StreamState] = None
+        self._pending_lk: Optional[LiveKitState] = None
+        self._pending_armed = False
+
+        # Periodic UI updater (останавливается, пока стрим offline)
+        self._tick_key = None
+        self._tick_armed = True
+        self.after(500, self._tick)
 
         # Close handler
         self.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -987,12 +1270,31 @@ class App(tk.Tk):
             else:
                 self.lbl_audio_drawer_summary.configure(text="Микрофон не найден")
 
+    def _arm_tick(self, delay_ms: int = 500):
+        if not self._tick_armed:
+            self._tick_armed = True
+            self.after(delay_ms, self._tick)
+
     def _tick(self):
+        # Опрос вместо пуша раз в секунду из фонового цикла: меньше cross-thread
+        # after(0), а при неизменном состоянии Tk-виджеты вообще не трогаем.
+        self._tick_armed = False
         if self.var_transport.get() == "LiveKit (native)":
-            self._render_livekit_state(self.livekit_client.state)
+            s = self.livekit_client.state
+            key = ("lk", s.running, s.connected, s.room_name, s.last_error)
+            if key != self._tick_key:
+                self._tick_key = key
+                self._render_livekit_state(s)
         else:
-            self._render_state(self.legacy_client.state)
-        self.after(1000, self._tick)
+            s = self.legacy_client.state
+            key = ("ws", s.running, s.ack, s.listeners, s.sent_bytes >> 10, s.dropped_bytes >> 10, int(s.uptime_sec), s.last_error)
+            if key != self._tick_key:
+                self._tick_key = key
+                self._render_state(s)
+        # Offline и состояние отрисовано — периодические пробуждения не нужны;
+        # on_start и события состояния взводят таймер заново.
+        if s.running:
+            self._arm_tick()
 
     def on_transport_changed(self):
         is_livekit = self.var_transport.get() == "LiveKit (native)"
@@ -1027,22 +1329,62 @@ class App(tk.Tk):
         self._update_audio_drawer_summary()
 
     def on_refresh_devices(self):
-        if self.var_transport.get() == "LiveKit (native)":
-            self.mic_devices = list_microphone_devices_only()
-            self.loopback_devices, lb_err = list_windows_loopback_devices()
-            self.input_devices = list_input_devices()
+        # Блокирующее перечисление — в пуле; Tk-виджеты обновляет
+        # _apply_devices уже на главном потоке
+        if self._refreshing:
+            return
+        self._refreshing = True
+        transport = self.var_transport.get()
+        if transport == "LiveKit (native)":
+            def work():
+                return (
+                    list_microphone_devices_only(),
+                    list_windows_loopback_devices(),
+                    list_input_devices(),
+                )
+        else:
+            work = list_pulse_sources
+        fut = self._pool.submit(work)
+        fut.add_done_callback(lambda f: self.after(0, self._apply_devices, transport, f))
+
+    def _fill_combo(self, combo, values):
+        """Обновить значения Combobox, только если список реально поменялся.
+
+        Tk-configure на длинном списке не бесплатен, а refresh чаще всего
+        возвращает тот же набор устройств; выбор пользователя сохраняется,
+        если выбранный пункт остался в списке.
+        """
+        key = tuple(values)
+        if self._combo_keys.get(combo) == key:
+            return
+        selected = combo.get()
+        combo["values"] = values
+        self._combo_keys[combo] = key
+        if selected in key:
+            combo.set(selected)
+        elif values:
+            combo.current(0)
+        else:
+            combo.set("")
+
+    def _apply_devices(self, transport: str, fut):
+        self._refreshing = False
+        if transport != self.var_transport.get():
+            return  # пользователь успел переключить транспорт — результат устарел
+        if transport == "LiveKit (native)":
+            try:
+                self.mic_devices, (self.loopback_devices, lb_err), self.input_devices = fut.result()
+            except Exception as e:
+                self.mic_devices, self.loopback_devices, self.input_devices = [], [], []
+                lb_err = str(e)
 
             if platform.system().lower() == "windows":
-                self.combo_win_loopback["values"] = [
+                self._fill_combo(self.combo_win_loopback, [
                     f"{d.device_id} — {d.name} ({d.backend})" for d in self.loopback_devices
-                ]
-                self.combo_win_mic["values"] = [
+                ])
+                self._fill_combo(self.combo_win_mic, [
                     f"{d.device_id} — {d.name} [{d.backend}]" for d in self.mic_devices
-                ]
-                if self.loopback_devices:
-                    self.combo_win_loopback.current(0)
-                if self.mic_devices:
-                    self.combo_win_mic.current(0)
+                ])
                 if lb_err and not self.loopback_devices:
                     self.lbl_loopback_hint.config(text=lb_err)
                 elif self.loopback_devices:
@@ -1058,16 +1400,16 @@ class App(tk.Tk):
                     )
                 self._on_win_audio_mode()
             else:
-                values = [f"{d.device_id} — {d.name} [{d.backend}]" for d in self.input_devices]
-                self.combo_device["values"] = values
-                if values:
-                    self.combo_device.current(0)
+                self._fill_combo(
+                    self.combo_device,
+                    [f"{d.device_id} — {d.name} [{d.backend}]" for d in self.input_devices],
+                )
         else:
-            self.pulse_sources = list_pulse_sources()
-            values = [f"{i} — {l}" for i, l in self.pulse_sources]
-            self.combo_device["values"] = values
-            if values:
-                self.combo_device.current(0)
+            try:
+                self.pulse_sources = fut.result()
+            except Exception:
+                self.pulse_sources = []
+            self._fill_combo(self.combo_device, [f"{i} — {l}" for i, l in self.pulse_sources])
         self._update_audio_drawer_summary()
 
     def on_create_vdev(self):
@@ -1152,6 +1494,7 @@ class App(tk.Tk):
                 )
                 self.btn_start.config(state="disabled")
                 self.btn_stop.config(state="normal")
+                self._arm_tick()
                 base = self._helper_url_for_viewer.rstrip("/")
                 viewer_url = f"{base}/"
                 self._set_web_viewer(
@@ -1176,10 +1519,11 @@ class App(tk.Tk):
                     channels=int(self.var_channels.get()),
                     rate=int(self.var_rate.get()),
                     bitrate=int(self.var_bitrate.get()),
-                    chunk_size=4096,
+                    chunk_size=SEND_CHUNK,
                 )
                 self.btn_start.config(state="disabled")
                 self.btn_stop.config(state="normal")
+                self._arm_tick()
                 self._set_web_viewer("— (legacy WebSocket: отдельной веб-страницы helper нет)", None)
                 self._set_error_log("")
             except Exception as e:
@@ -1199,53 +1543,107 @@ class App(tk.Tk):
             self.btn_stop.config(state="disabled")
 
     def on_livekit_state_update(self, state: LiveKitState):
-        self.after(0, lambda s=state: self._render_livekit_state(s))
+        # Вызывается из потока цикла LiveKit: публикуем неизменяемый снимок
+        # в слот; серия событий подряд схлопывается в один рендер
+        with self._pending_lock:
+            self._pending_lk = replace(state)
+            arm = not self._pending_armed
+            self._pending_armed = True
+        if arm:
+            self.after_idle(self._consume_pending)
+
+    def _consume_pending(self):
+        with self._pending_lock:
+            p_legacy, self._pending_legacy = self._pending_legacy, None
+            p_lk, self._pending_lk = self._pending_lk, None
+            self._pending_armed = False
+        if p_lk is not None:
+            self._render_livekit_state(p_lk)
+        if p_legacy is not None:
+            self._render_state(p_legacy)
+        self._arm_tick()
+
+    def _set_status(self, text: str, fg: str):
+        if (text, fg) != self._last_status:
+            self._last_status = (text, fg)
+            self.var_status.set(text)
+            self.lbl_status.config(foreground=fg)
+
+    def _set_extra(self, text: str):
+        if text != self._last_extra:
+            self._last_extra = text
+            self.var_extra.set(text)
 
     def _render_livekit_state(self, state: LiveKitState):
         if state.running:
-            self.lbl_status.config(
-                text=f"Статус: {'online' if state.connected else 'подключение...'}",
-                foreground=("#0a0" if state.connected else "#b60"),
+            self._set_status(
+                f"Статус: {'online' if state.connected else 'подключение...'}",
+                "#0a0" if state.connected else "#b60",
             )
             self.btn_start.config(state="disabled")
             self.btn_stop.config(state="normal")
         else:
-            self.lbl_status.config(text="Статус: offline", foreground="#b00")
+            self._set_status("Статус: offline", "#b00")
             self.btn_start.config(state="normal")
             self.btn_stop.config(state="disabled")
-        self.lbl_extra.config(
-            text=f"LiveKit room: {state.room_name or '-'} | Connected: {'yes' if state.connected else 'no'}"
+        self._set_extra(
+            f"LiveKit room: {state.room_name or '-'} | Connected: {'yes' if state.connected else 'no'}"
         )
-        self.title("Audio Streamer (LiveKit)")
+        if self._last_bytes_key is not None:
+            self._last_bytes_key = None
+            self.var_bytes.set("")
         self._set_error_log(state.last_error or "")
 
     def on_state_update(self, state: StreamState):
-        self.after(0, lambda s=state: self._render_state(s))
+        # Вызывается из stream-loop потока — тот же слот-снимок, что и у LiveKit
+        with self._pending_lock:
+            self._pending_legacy = replace(state)
+            arm = not self._pending_armed
+            self._pending_armed = True
+        if arm:
+            self.after_idle(self._consume_pending)
 
     def _render_state(self, state: StreamState):
+        # Ранний выход до какого-либо форматирования: рендер зовут и тик,
+        # и снимки событий, и чаще всего между ними ничего не поменялось
+        render_key = (
+            state.running, state.ack, state.listeners,
+            state.sent_bytes >> 10, state.dropped_bytes >> 10,
+            int(state.uptime_sec), state.last_error,
+        )
+        if render_key == self._last_render:
+            return
+        self._last_render = render_key
         if state.running:
             if state.ack:
-                self.lbl_status.config(text="Статус: online (сервер подтвердил стрим)", foreground="#0a0")
+                self._set_status("Статус: online (сервер подтвердил стрим)", "#0a0")
             else:
-                self.lbl_status.config(text="Статус: подключение/отправка...", foreground="#b60")
+                self._set_status("Статус: подключение/отправка...", "#b60")
             self.btn_start.config(state="disabled")
             self.btn_stop.config(state="normal")
         else:
-            self.lbl_status.config(text="Статус: offline", foreground="#b00")
+            self._set_status("Статус: offline", "#b00")
             self.btn_start.config(state="normal")
             self.btn_stop.config(state="disabled")
 
-        kib = state.sent_bytes / 1024.0
-        self.lbl_extra.config(
-            text=f"Слушателей: {state.listeners} | Отправлено: {kib:.1f} KiB | Аптайм: {int(state.uptime_sec)} c"
-        )
-        self.title("Audio Streamer (LiveKit)")
+        self._set_extra(f"Слушателей: {state.listeners} | Аптайм: {int(state.uptime_sec)} c")
+        # Ключ — целые KiB (целые MiB после первого мегабайта): пока корзина
+        # та же, ни форматирования, ни Tcl-вызова не происходит
+        kib = state.sent_bytes >> 10
+        bkey = (kib >> 10 if kib >= 1024 else kib, state.dropped_bytes >> 10)
+        if bkey != self._last_bytes_key:
+            self._last_bytes_key = bkey
+            txt = f"Отправлено: {kib >> 10} MiB" if kib >= 1024 else f"Отправлено: {kib} KiB"
+            if state.dropped_bytes:
+                txt += f" | Потеряно: {state.dropped_bytes >> 10} KiB"
+            self.var_bytes.set(txt)
         self._set_error_log(state.last_error or "")
 
     def on_close(self):
         try:
             self.livekit_client.stop()
             self.legacy_client.stop()
+            self.legacy_client.dispose()
         except Exception:
             pass
         self.after(300, self.destroy)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import html
 import os
 import sys
@@ -68,8 +69,11 @@ async def client_discovery(request: web.Request) -> web.Response:
     )
 
 
-async def index(request: web.Request) -> web.Response:
-    default_lk = html.escape(_default_livekit_ws_url(request), quote=True)
+# Страница зависит только от подставляемого LiveKit URL (обычно 1-2 варианта
+# на процесс: env или host запроса) — рендерим и кодируем её один раз на URL,
+# а не ~2 КиБ f-string + encode на каждый GET /
+@functools.lru_cache(maxsize=8)
+def _render_index(default_lk: str) -> bytes:
     page = f"""<!doctype html>
 <html lang="ru">
 <head>
@@ -158,11 +162,21 @@ async def index(request: web.Request) -> web.Response:
 </body>
 </html>
 """
-    return web.Response(text=page, content_type="text/html")
+    return page.encode("utf-8")
+
+
+async def index(request: web.Request) -> web.Response:
+    default_lk = html.escape(_default_livekit_ws_url(request), quote=True)
+    return web.Response(body=_render_index(default_lk), content_type="text/html", charset="utf-8")
+
+
+# Тело ответа константно — сериализуем один раз при импорте, а не на каждый
+# запрос мониторинга
+_HEALTHZ_BODY = b'{"status": "ok"}'
 
 
 async def healthz(_: web.Request) -> web.Response:
-    return web.json_response({"status": "ok"})
+    return web.Response(body=_HEALTHZ_BODY, content_type="application/json")
 
 
 async def livekit_token(request: web.Request) -> web.Response:
@@ -350,6 +364,13 @@ def print_client_connection_banner(*, bind_host: str, bind_port: int) -> None:
 
 
 def main() -> None:
+    # uvloop заметно дешевле на мелких записях в сокеты; строго опционален —
+    # на Windows его нет, без него всё работает как раньше
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     _load_project_env()
     parser = argparse.ArgumentParser(description="LiveKit helper service for web viewer + token issuing")
     parser.add_argument("--host", default="0.0.0.0")